@@ -0,0 +1,268 @@
+import os
+import sys
+import glob
+import json
+import hashlib
+import sqlite3
+import argparse
+import subprocess
+import statistics
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+# ==============================================================================
+# Local regression history for the cocotb_* projects.
+# Each `make` overwrites results.xml; this keeps every run in an SQLite file.
+# ==============================================================================
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(HERE, "results_history.db")
+
+# Files every simulation rewrites; they must not mark the tree dirty
+SIM_OUTPUTS = [":(top,exclude,glob)**/results.xml", ":(top,exclude,glob)**/sim_build/**"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    project     TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    git_rev     TEXT,
+    seed        INTEGER,
+    params      TEXT,
+    digest      TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    test        TEXT NOT NULL,
+    status      TEXT NOT NULL CHECK (status IN ('pass', 'fail', 'skip')),
+    wall_s      REAL,
+    sim_ns      REAL,
+    ns_per_s    REAL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results(test, run_id);
+"""
+
+
+def open_db(path):
+    """Open (and create if needed) the history database."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def git_revision(path):
+    """
+    Return the current git commit of the tree containing path, or None.
+    Adds "-dirty" for uncommitted changes outside the simulation outputs.
+    """
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=path,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", ":(top)"]
+                               + SIM_OUTPUTS, cwd=path,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return rev + "-dirty" if dirty else rev
+
+
+def parse_results(xml_path):
+    """
+    Parse a cocotb results.xml.
+    Returns (seed, list of per-test dicts).
+    """
+    root = ET.parse(xml_path).getroot()
+    seed = None
+    tests = []
+
+    for prop in root.iter("property"):
+        if prop.get("name") == "random_seed":
+            seed = int(prop.get("value"))
+
+    for case in root.iter("testcase"):
+        if case.find("failure") is not None or case.find("error") is not None:
+            status = "fail"
+        elif case.find("skipped") is not None:
+            status = "skip"
+        else:
+            status = "pass"
+        wall = float(case.get("time", 0) or 0)
+        sim = float(case.get("sim_time_ns", 0) or 0)
+        ratio = case.get("ratio_time")
+        ratio = float(ratio) if ratio else (sim / wall if wall else None)
+        tests.append({
+            "test": f"{case.get('classname')}.{case.get('name')}",
+            "status": status,
+            "wall_s": wall,
+            "sim_ns": sim,
+            "ns_per_s": ratio,
+        })
+
+    return seed, tests
+
+
+def ingest(conn, xml_path, params=None):
+    """
+    Store one results.xml. Returns the number of tests stored,
+    or 0 if this exact file was ingested before.
+    """
+    with open(xml_path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+
+    project = os.path.basename(os.path.dirname(os.path.abspath(xml_path)))
+    seed, tests = parse_results(xml_path)
+
+    try:
+        cur = conn.execute(
+            "INSERT INTO runs (project, ingested_at, git_rev, seed, params, digest) VALUES (?, ?, ?, ?, ?, ?)",
+            (project, datetime.now(timezone.utc).isoformat(timespec="seconds"),
+             git_revision(os.path.dirname(os.path.abspath(xml_path))), seed,
+             json.dumps(params or {}, sort_keys=True), digest))
+    except sqlite3.IntegrityError:
+        return 0
+
+    conn.executemany(
+        "INSERT INTO results (run_id, test, status, wall_s, sim_ns, ns_per_s) VALUES (?, ?, ?, ?, ?, ?)",
+        [(cur.lastrowid, t["test"], t["status"], t["wall_s"], t["sim_ns"], t["ns_per_s"]) for t in tests])
+    conn.commit()
+    return len(tests)
+
+
+def history(conn, test=None, limit=20):
+    """Most recent results, newest first, optionally for a single test."""
+    sql = ("SELECT r.id, r.project, r.ingested_at, r.git_rev, r.seed, t.test, t.status, t.ns_per_s "
+           "FROM results t JOIN runs r ON r.id = t.run_id")
+    args = []
+    if test:
+        # Match the full name or just the test function (e.g. alu_random_test)
+        suffix = "." + test
+        sql += " WHERE t.test = ? OR substr(t.test, ?) = ?"
+        args += [test, -len(suffix), suffix]
+    sql += " ORDER BY r.id DESC, t.test LIMIT ?"
+    args.append(limit)
+    return conn.execute(sql, args).fetchall()
+
+
+def find_regressions(conn, window=5, threshold=0.10, min_runs=3):
+    """
+    Compare each test's latest passing run against the median ns-per-second
+    of its previous `window` passing runs with the same project and params,
+    so a simulator or parameter change does not count as a regression.
+    Returns (project, test, latest, baseline, slowdown) for tests slower
+    than threshold.
+    """
+    if not window >= min_runs >= 1:
+        raise ValueError(f"Need window >= min-runs >= 1, got window={window}, min-runs={min_runs}")
+
+    flagged = []
+    latest_runs = conn.execute(
+        "SELECT t.test, r.project, r.params, MAX(r.id) FROM results t JOIN runs r ON r.id = t.run_id "
+        "WHERE t.status = 'pass' AND t.ns_per_s IS NOT NULL "
+        "GROUP BY t.test, r.project, r.params").fetchall()
+    latest_runs.sort(key=lambda row: row[3], reverse=True)
+
+    seen = set()
+    for test, project, params, _ in latest_runs:
+        # Only the configuration that ran most recently is checked per test
+        if (project, test) in seen:
+            continue
+        seen.add((project, test))
+        rates = [row[0] for row in conn.execute(
+            "SELECT t.ns_per_s FROM results t JOIN runs r ON r.id = t.run_id "
+            "WHERE t.test = ? AND r.project = ? AND r.params = ? "
+            "AND t.status = 'pass' AND t.ns_per_s IS NOT NULL "
+            "ORDER BY r.id DESC LIMIT ?", (test, project, params, window + 1))]
+        if len(rates) < min_runs + 1:
+            continue
+        latest, previous = rates[0], rates[1:]
+        baseline = statistics.median(previous)
+        # Tests that never advance simulated time have no meaningful rate
+        if baseline <= 0:
+            continue
+        slowdown = 1 - latest / baseline
+        if slowdown > threshold:
+            flagged.append((project, test, latest, baseline, slowdown))
+
+    return flagged
+
+
+def parse_params(items):
+    """Parse KEY=VALUE pairs given on the command line."""
+    params = {}
+    for item in items or []:
+        key, sep, val = item.partition("=")
+        if not sep:
+            raise ValueError(f"Bad parameter '{item}', expected KEY=VALUE")
+        params[key] = val
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track cocotb results.xml history")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="SQLite database file")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("ingest", help="Store results.xml files")
+    p.add_argument("files", nargs="*", help="results.xml files (default: every cocotb_* project)")
+    p.add_argument("--param", action="append", metavar="KEY=VALUE", help="Run parameter (repeatable)")
+
+    p = sub.add_parser("history", help="Show pass/fail and sim-ns-per-second history")
+    p.add_argument("--test", type=str, default=None, help="Test name, e.g. alu_random_test")
+    p.add_argument("--limit", type=int, default=20, help="Number of rows to show")
+
+    p = sub.add_parser("regressions", help="Flag tests slower than their rolling baseline")
+    p.add_argument("--window", type=int, default=5, help="Number of previous runs in the baseline")
+    p.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)")
+    p.add_argument("--min-runs", type=int, default=3, help="Runs needed before a test is checked")
+
+    args = parser.parse_args()
+    conn = open_db(args.db)
+
+    if args.cmd == "ingest":
+        try:
+            params = parse_params(args.param)
+        except ValueError as e:
+            parser.error(str(e))
+        files = args.files or sorted(glob.glob(os.path.join(HERE, "cocotb_*", "results.xml")))
+        errors = 0
+        for path in files:
+            try:
+                n = ingest(conn, path, params)
+            except (OSError, ValueError, ET.ParseError) as e:
+                print(f"Error reading {path}: {e}", file=sys.stderr)
+                errors += 1
+                continue
+            if n:
+                print(f"Ingested {n} tests from {path}")
+            else:
+                print(f"Skipped {path} (already ingested)")
+        if errors:
+            conn.close()
+            sys.exit(1)
+
+    elif args.cmd == "history":
+        print(f"{'run':>5}  {'project':<20} {'time':<25} {'rev':<14} {'seed':>11}  "
+              f"{'test':<32} {'result':<6} {'sim ns/s':>12}")
+        for run_id, project, when, rev, seed, test, status, rate in history(conn, args.test, args.limit):
+            rate = f"{rate:12.1f}" if rate is not None else f"{'-':>12}"
+            print(f"{run_id:>5}  {project:<20} {when:<25} {rev or '-':<14} {seed if seed is not None else '-':>11}  "
+                  f"{test:<32} {status.upper():<6} {rate}")
+
+    elif args.cmd == "regressions":
+        try:
+            flagged = find_regressions(conn, args.window, args.threshold, args.min_runs)
+        except ValueError as e:
+            parser.error(str(e))
+        for project, test, latest, baseline, slowdown in flagged:
+            print(f"REGRESSION {project}/{test}: {latest:.1f} sim ns/s vs baseline {baseline:.1f} "
+                  f"({slowdown:.0%} slower)")
+        if not flagged:
+            print("No performance regressions")
+        conn.close()
+        sys.exit(1 if flagged else 0)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
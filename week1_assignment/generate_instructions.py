@@ -0,0 +1,246 @@
+import os
+import sys
+import math
+import numbers
+import argparse
+import yaml
+import json
+import numpy as np
+
+from list_combinations import collect_combinations
+
+# Bit positions of the fixed fields in a 32-bit RISC-V instruction word
+OPCODE_MASK = 0x7F
+FUNCT3_SHIFT = 12
+FUNCT7_SHIFT = 25
+
+CHUNK_SIZE = 1 << 20
+
+# Instruction selection goes through a table of 2**SELECT_BITS slots, so
+# weights are resolved to 1/65536. Much faster than a CDF search per word.
+# Every instruction with a positive weight gets at least one slot.
+SELECT_BITS = 16
+
+# Four ASCII hex digits for every 16-bit value, viewed as one uint32 each
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+HEX16 = np.stack([HEX_DIGITS[(np.arange(1 << 16) >> s) & 0xF] for s in (12, 8, 4, 0)],
+                 axis=1).copy().view("<u4").ravel()
+HEX_LINE = np.dtype([("hi", "<u4"), ("lo", "<u4"), ("nl", "u1")])
+
+
+def load_instructions(path):
+    """
+    Load instruction entries from a combinations.json file or a directory of
+    extension YAML files.
+    Returns a list of dicts with extension, name, opcode, funct3 and funct7.
+    """
+    if os.path.isdir(path):
+        combos = collect_combinations(path)
+    else:
+        with open(path, "r") as f:
+            combos = json.load(f)
+
+    entries = []
+    for extension, fields_list in combos.items():
+        for i, fields in enumerate(fields_list):
+            if fields.get("opcode") is None:
+                continue
+            entries.append({
+                "extension": extension,
+                "name": fields.get("name") or f"{extension}_{i}",
+                "opcode": fields["opcode"],
+                "funct3": fields.get("funct3"),
+                "funct7": fields.get("funct7"),
+            })
+
+    return entries
+
+
+def build_tables(entries, weights=None):
+    """
+    Precompute per-instruction fixed bits, random-field masks and the
+    weighted selection table.
+
+    Fixed bits are opcode plus funct3/funct7 when the instruction defines
+    them. Every other bit (rd, rs1, rs2, immediates) is left random.
+    Weights may be keyed by extension or instruction name; both multiply.
+    """
+    if not entries:
+        raise ValueError("No instructions to generate from")
+
+    weights = weights or {}
+    known = {e["extension"] for e in entries} | {e["name"] for e in entries}
+    for key, val in weights.items():
+        if key not in known:
+            raise ValueError(f"Weight '{key}' matches no extension or instruction")
+        check_weight(key, val)
+
+    base = np.empty(len(entries), dtype=np.uint32)
+    free = np.empty(len(entries), dtype=np.uint32)
+    prob = np.empty(len(entries), dtype=np.float64)
+
+    for i, e in enumerate(entries):
+        word = e["opcode"] & OPCODE_MASK
+        fixed = OPCODE_MASK
+        if e["funct3"] is not None:
+            word |= (e["funct3"] & 0x7) << FUNCT3_SHIFT
+            fixed |= 0x7 << FUNCT3_SHIFT
+        if e["funct7"] is not None:
+            word |= (e["funct7"] & 0x7F) << FUNCT7_SHIFT
+            fixed |= 0x7F << FUNCT7_SHIFT
+        base[i] = word
+        free[i] = ~fixed & 0xFFFFFFFF
+        prob[i] = weights.get(e["extension"], 1.0) * weights.get(e["name"], 1.0)
+
+    total = prob.sum()
+    if total <= 0:
+        raise ValueError("All instruction weights are zero")
+    if np.count_nonzero(prob) > 1 << SELECT_BITS:
+        raise ValueError(f"More than {1 << SELECT_BITS} weighted instructions")
+
+    # Largest-remainder rounding of the shares to slot counts
+    share = prob / total * (1 << SELECT_BITS)
+    counts = np.floor(share).astype(np.int64)
+    counts[(prob > 0) & (counts == 0)] = 1
+    extra = (1 << SELECT_BITS) - counts.sum()
+    if extra > 0:
+        remainder = np.where(prob > 0, counts - share, np.inf)
+        counts[np.argsort(remainder)[:extra]] += 1
+    while extra < 0:
+        counts[np.argmax(counts)] -= 1
+        extra += 1
+
+    index_type = np.min_scalar_type(len(entries) - 1)
+    select = np.repeat(np.arange(len(entries), dtype=index_type), counts)
+
+    return base, free, select
+
+
+def generate_words(tables, count, rng):
+    """
+    Generate `count` instruction words as a uint32 array.
+    Selection and field assembly are fully vectorized.
+
+    Each word consumes exactly one raw 64-bit draw (low 32 bits for the
+    random fields, top 16 bits for the selection), so a seeded stream is
+    the same however it is split into calls.
+    """
+    base, free, select = tables
+    raw = rng.bit_generator.random_raw(count)
+    # Little-endian views: word 0 of each uint64 is its low half,
+    # halfword 3 its top 16 bits
+    idx = select[raw.view(np.uint16)[3::4]]
+    return base[idx] | (raw.view(np.uint32)[0::2] & free[idx])
+
+
+def to_hex_lines(words):
+    """
+    Render words as newline-separated 8-digit hex without a Python loop.
+    """
+    lines = np.empty(len(words), dtype=HEX_LINE)
+    lines["hi"] = HEX16[words >> 16]
+    lines["lo"] = HEX16[words & 0xFFFF]
+    lines["nl"] = ord("\n")
+    return lines.tobytes()
+
+
+def iter_chunks(path, count=None, seed=None, weights=None, chunk_size=CHUNK_SIZE):
+    """
+    Iterator over uint32 arrays of at most chunk_size instruction words.
+    Runs forever when count is None. The concatenated stream depends only
+    on the seed, not on chunk_size.
+    """
+    if count is not None and count < 0:
+        raise ValueError("count must be >= 0")
+    tables = build_tables(load_instructions(path), weights)
+    rng = np.random.default_rng(seed)
+    remaining = count
+    while remaining is None or remaining > 0:
+        n = chunk_size if remaining is None else min(chunk_size, remaining)
+        yield generate_words(tables, n, rng)
+        if remaining is not None:
+            remaining -= n
+
+
+def iter_words(path, count=None, seed=None, weights=None, chunk_size=CHUNK_SIZE):
+    """
+    Python iterator over instruction words (as ints).
+    Convenient but much slower than iter_chunks for large corpora.
+    """
+    for chunk in iter_chunks(path, count, seed, weights, chunk_size):
+        yield from chunk.tolist()
+
+
+def check_weight(key, val):
+    """
+    Reject weights that would corrupt the selection table.
+    """
+    if not isinstance(val, numbers.Real) or not math.isfinite(val) or val < 0:
+        raise ValueError(f"Weight for '{key}' must be a finite number >= 0, got {val!r}")
+
+
+def parse_weights(items):
+    """
+    Parse NAME=WEIGHT pairs given on the command line.
+    """
+    weights = {}
+    for item in items or []:
+        key, sep, val = item.partition("=")
+        if not sep:
+            raise ValueError(f"Bad weight '{item}', expected NAME=WEIGHT")
+        try:
+            weights[key] = float(val)
+        except ValueError:
+            raise ValueError(f"Bad weight '{item}', WEIGHT must be a number")
+        check_weight(key, weights[key])
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate random legal instruction words")
+    parser.add_argument("--src", type=str, default="combinations.json",
+                        help="combinations.json file or directory with YAML files")
+    parser.add_argument("--count", type=int, required=True, help="Number of words to generate")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--weight", action="append", metavar="NAME=WEIGHT",
+                        help="Weight for an extension or instruction (repeatable)")
+    parser.add_argument("--format", choices=["bin", "hex"], default="hex", help="Output format")
+    parser.add_argument("--out", type=str, default=None, help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.count < 0:
+        parser.error("--count must be >= 0")
+    try:
+        tables = build_tables(load_instructions(args.src), parse_weights(args.weight))
+    except (OSError, json.JSONDecodeError, yaml.YAMLError) as e:
+        parser.error(f"Cannot read {args.src}: {e}")
+    except ValueError as e:
+        parser.error(str(e))
+    rng = np.random.default_rng(args.seed)
+
+    if args.out:
+        out = open(args.out, "wb")
+    else:
+        out = sys.stdout.buffer
+
+    try:
+        remaining = args.count
+        while remaining > 0:
+            n = min(CHUNK_SIZE, remaining)
+            words = generate_words(tables, n, rng)
+            if args.format == "bin":
+                # Little-endian, as the words would sit in memory
+                out.write(words.astype("<u4").tobytes())
+            else:
+                out.write(to_hex_lines(words))
+            remaining -= n
+    finally:
+        if args.out:
+            out.close()
+
+    if args.out:
+        print(f"Saved {args.count} words to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
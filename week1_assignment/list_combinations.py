@@ -39,7 +39,7 @@ def collect_combinations(root):
     """
     combos = defaultdict(list)
 
-    for fname in os.listdir(root):
+    for fname in sorted(os.listdir(root)):
         if not fname.endswith(".yaml"):
             continue
 
@@ -61,7 +61,8 @@ def collect_combinations(root):
             tup = (fields["opcode"], fields["funct3"], fields["funct7"])
             # Only add if at least one field is not None and it's not a duplicate
             if tup not in seen and any(fields.values()):
-                combos[extension].append(fields)
+                # Keep the mnemonic so tools can refer to instructions by name
+                combos[extension].append(dict(fields, name=insn.get("name")))
                 seen.add(tup)
 
     return combos